@@ -18,6 +18,9 @@ SL01_T = sl01.TSL4531(I2C0)
 SL01_T.init()
 
 while True:
+	SL01_T.trigger()	# start a conversion
+	while not SL01_T.poll_ready():
+		sleep(5)		# other work can run here
 	lux=SL01_T.getLUX()	#return ambient light level as lux
 	print('Light level: ', lux, ' LUX')
 
@@ -0,0 +1,28 @@
+##############################################
+#   This is an example for SL01 UV and light
+#	sensor.
+#
+#   UV data and ambient light level are read
+# 	together and printed out on the console.
+##############################################
+
+import streams
+from xinabox.sl01 import sl01
+
+streams.serial()
+
+# SL01 instance
+SL01 = sl01.SL01(I2C0)
+
+# configure and start both sensors
+SL01.init()
+
+while True:
+    SL01.trigger()		# start a measurement on both sensors
+    while not SL01.poll_ready():
+        sleep(5)		# other work can run here
+    uva, uvb, uvi, lux = SL01.sample()	# return uva, uvb intensity, uv index and lux
+    
+    print('UVA Intensity: {} uW/m^2\nUVB Intensity: {} uW/m^2\nUV Index     : {}\nLight level  : {} LUX\n'.format(uva, uvb, uvi, lux))
+    
+    sleep(2000)
@@ -18,12 +18,11 @@ SL01_V = sl01.VEML6075(I2C0)
 SL01_V.init()
 
 while True:
-    uva=SL01_V.getUVA()		# return uva intensity 
-    uvb=SL01_V.getUVB()		# return uvb intensity
-    uvi=SL01_V.getUVIndex()	# return uv index
+    SL01_V.trigger()		# start a measurement
+    while not SL01_V.poll_ready():
+        sleep(5)		# other work can run here
+    uva, uvb, uvi = SL01_V.read_all()	# return uva, uvb intensity and uv index
     
-    print('UVA Intensity: ', uva, ' uW/m^2\n\n')
-    print('UVB Intensity: ', uvb, ' uW/m^2\n\n')
-    print('UV Index     : ', uvi, '\n\n')
+    print('UVA Intensity: {} uW/m^2\nUVB Intensity: {} uW/m^2\nUV Index     : {}\n'.format(uva, uvb, uvi))
     
     sleep(2000)
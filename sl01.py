@@ -17,6 +17,7 @@ Data Sheets:
     """
 
 import i2c
+import timers
 
 # Defines VEML6075 Registers
 VEML6075_REG_CONF           = 0x00  # Configuration register 
@@ -31,7 +32,7 @@ VEML6075_CONF_HD_HIGH       = 0x80  # High Dynamic Setting
 VEML6075_CONF_UV_TRIG_ONCE  = 0x04  # Triggers UV Measurement Once
 VEML6075_CONF_UV_TRIG_NORM  = 0x00  # Normal Mode Operation
 VEML6075_CONF_AF_FORCE      = 0x00  # Normal Mode Enabled
-VEML6075_CONF_AF_AUTO       = 0x02  # Active Force Mode Disabled
+VEML6075_CONF_AF_AUTO       = 0x02  # Active Force Mode Enabled
 VEML6075_CONF_SD_OFF        = 0x00  # Power ON
 VEML6075_CONF_SD_ON         = 0x01  # Power OFF
 
@@ -49,6 +50,8 @@ VEML6075_UVB_VIS_COEFF      = 2.95
 VEML6075_UVB_IR_COEFF       = 1.74
 VEML6075_UVA_RESP           = (1.0 / 684.46)
 VEML6075_UVB_RESP           = (1.0 / 385.95)
+VEML6075_UVA_RESP_HALF      = (VEML6075_UVA_RESP * 0.5)
+VEML6075_UVB_RESP_HALF      = (VEML6075_UVB_RESP * 0.5)
 
 # Defines TSL4531 Registers
 TSL4531_REG_CONTROL     = 0x00  # Control Register Address
@@ -75,26 +78,32 @@ class VEML6075(i2c.I2C):
 VEML6075 class
 ===============
 
-.. class:: VEML6075(self, drvname, addr=0x10, clk=100000)
+.. class:: VEML6075(self, drvname, addr=0x10, clk=400000, max_age_ms=100)
 
         Create an instance of the VEML6075 class.
 
         :param drvname: I2C Bus used '( I2C0, ... )'
         :param addr: Slave address, default 0x10
-        :param clk: Clock speed, default 100kHz
+        :param clk: Clock speed, default 400kHz (fast-mode, pull-ups of 2.2kOhm or less may be needed)
+        :param max_age_ms: Readings younger than this are reused instead of read again, default 100ms. Zero or negative always reads the sensor
+
+        The getters block until a measurement completes. To keep the main loop free while the
+        sensor integrates, call :meth:`trigger`, check :meth:`poll_ready` and then read with :meth:`read_all`.
 
     '''
 
-    def __init__(self, drvname = I2C0, addr = 0x10, clk = 100000):
+    def __init__(self, drvname = I2C0, addr = 0x10, clk = 400000, max_age_ms = 100):
         i2c.I2C.__init__(self, drvname, addr, clk)
-        self._addr = addr
-        self.__UVAintensity = 0.0
-        self.__UVBintensity = 0.0
-        self.__UVindex = 0.0
-        self.__rawUVA = 0
-        self.__rawUVB = 0
-        self.__UVcomp1 = 0
-        self.__UVcomp2 = 0
+        self._wr = self.write_read
+        self.max_age_ms = max_age_ms
+        self._conf = VEML6075_CONF_IT_100 | VEML6075_CONF_AF_AUTO | VEML6075_CONF_SD_OFF
+        self.__integration_ms = 100  # matches VEML6075_CONF_IT_100
+        self._coeff = (VEML6075_UVA_VIS_COEFF, VEML6075_UVA_IR_COEFF,
+                       VEML6075_UVB_VIS_COEFF, VEML6075_UVB_IR_COEFF,
+                       VEML6075_UVA_RESP_HALF, VEML6075_UVB_RESP_HALF)
+        self.__last_read_ms = -10**9
+        self.__trigger_ms = 0
+        self.__triggered = False
         try:
             self.start()
         except PeripheralError as e:
@@ -105,17 +114,71 @@ VEML6075 class
         '''
 .. method:: init()
 
-        Configure registers of VEML6075 for UV measurements.
+        Configure registers of VEML6075 for UV measurements in active force mode:
+        a measurement is only taken after :meth:`trigger` is called.
         Call after instantiating VEML6075 class.
         Exception raised if unsuccessful.
 
         '''
         try:
-            self.write_bytes(VEML6075_REG_CONF, VEML6075_CONF_IT_100)
-            self.write_bytes(0x00)
+            cur = self.write_read(VEML6075_REG_CONF, 2)
+            if cur[0] != self._conf or cur[1] != 0x00:
+                self.write_bytes(VEML6075_REG_CONF, self._conf, 0x00)
         except Exception as e:
             print(e)
             raise e
+
+    def trigger(self):
+        '''
+.. method:: trigger()
+
+        Starts a single UV measurement. Results are available when :meth:`poll_ready` returns True.
+
+        '''
+        self.write_bytes(VEML6075_REG_CONF, self._conf | VEML6075_CONF_UV_TRIG_ONCE, 0x00)
+        self.__trigger_ms = timers.now()
+        self.__triggered = True
+
+    def pending(self):
+        '''
+.. method:: pending()
+
+        Returns True when a measurement has been triggered and not read yet.
+
+        '''
+        return self.__triggered
+
+    def poll_ready(self):
+        '''
+.. method:: poll_ready()
+
+        Returns True when the integration time of the last triggered measurement has elapsed,
+        False if no measurement has been triggered.
+
+        '''
+        if not self.__triggered:
+            return False
+        return (timers.now() - self.__trigger_ms) >= (self.__integration_ms + 5)
+
+    def set_coefficients(self, uva_vis, uva_ir, uvb_vis, uvb_ir, uva_resp, uvb_resp):
+        '''
+.. method:: set_coefficients(uva_vis, uva_ir, uvb_vis, uvb_ir, uva_resp, uvb_resp)
+
+        Sets the visible/IR compensation coefficients and the UVA/UVB responsivities used
+        for the calculations, e.g. for a sensor behind a diffuser. Defaults are the open air
+        values from the VEML6075 application note.
+
+        :param uva_vis: UVA visible compensation coefficient
+        :param uva_ir: UVA IR compensation coefficient
+        :param uvb_vis: UVB visible compensation coefficient
+        :param uvb_ir: UVB IR compensation coefficient
+        :param uva_resp: UVA responsivity
+        :param uvb_resp: UVB responsivity
+
+        '''
+        self._coeff = (uva_vis, uva_ir, uvb_vis, uvb_ir, uva_resp * 0.5, uvb_resp * 0.5)
+        self.__last_read_ms = -10**9
+
     def getUVA(self):
         '''
 .. method:: getUVA()
@@ -150,33 +213,53 @@ VEML6075 class
 
         '''
         self.GET_VEML()
-        self.calculateIndex()
         return self.__UVindex
 
+    def read_all(self, raw=False):
+        '''
+.. method:: read_all(raw=False)
+
+        Reads the UVA, UVB and UV Index values with a single sensor read.
+
+        :param raw: If True, also return the raw UVA, UVB, UVCOMP1 and UVCOMP2 counts
+
+        Return a tuple (uva, uvb, uvi) of floats, or (uva, uvb, uvi, raw_a, raw_b, c1, c2) if *raw* is True.
+
+        '''
+        self.GET_VEML()
+        if raw:
+            return (self.__UVAintensity, self.__UVBintensity, self.__UVindex,
+                    self.__rawUVA, self.__rawUVB, self.__UVcomp1, self.__UVcomp2)
+        return (self.__UVAintensity, self.__UVBintensity, self.__UVindex)
+
     def GET_VEML(self):
+        now = timers.now()
+        if not self.__triggered and self.max_age_ms > 0 and now - self.__last_read_ms < self.max_age_ms:
+            return
+        if not self.__triggered:
+            self.trigger()
+        while not self.poll_ready():
+            sleep(5)
+        self.__triggered = False
         self.readUVdata()
-        self.__UVAintensity = float(self.__rawUVA)
-        self.__UVBintensity = float(self.__rawUVB)
-        self.__UVAintensity -= (VEML6075_UVA_VIS_COEFF * self.__UVcomp1) - (VEML6075_UVA_IR_COEFF * self.__UVcomp2)
-        self.__UVBintensity -= (VEML6075_UVB_VIS_COEFF * self.__UVcomp1) - (VEML6075_UVB_IR_COEFF * self.__UVcomp2)
+        self.__last_read_ms = timers.now()
+        # unpack coefficients once so the arithmetic only uses locals
+        va, ia, vb, ib, ra, rb = self._coeff
+        c1 = self.__UVcomp1
+        c2 = self.__UVcomp2
+        a = self.__rawUVA - (va * c1) + (ia * c2)
+        b = self.__rawUVB - (vb * c1) + (ib * c2)
+        self.__UVAintensity = a
+        self.__UVBintensity = b
+        self.__UVindex = (a * ra) + (b * rb)
 
     def readUVdata(self):
-        self.__rawUVA = self.readVEML(VEML6075_REG_UVA)
-        self.__rawUVB = self.readVEML(VEML6075_REG_UVB)
-        self.__UVcomp1 = self.readVEML(VEML6075_REG_UVCOMP1)
-        self.__UVcomp2 = self.readVEML(VEML6075_REG_UVCOMP2)
-
-    def calculateIndex(self):
-        UVAComp = 0
-        UVBComp = 0
-        UVAComp = (self.__UVAintensity * VEML6075_UVA_RESP)
-        UVBComp = (self.__UVBintensity * VEML6075_UVB_RESP)
-        self.__UVindex = (UVAComp + UVBComp)/2.0
-
-    def readVEML(self, reg):
-        raw=self.write_read(reg, 2)
-        value = raw[1]*256 + raw[0]
-        return value
+        # UVA (0x07) to UVCOMP2 (0x0B) in one burst, 0x08 is reserved
+        buf = self._wr(VEML6075_REG_UVA, 10)
+        self.__rawUVA = (buf[1] << 8) | buf[0]
+        self.__rawUVB = (buf[5] << 8) | buf[4]
+        self.__UVcomp1 = (buf[7] << 8) | buf[6]
+        self.__UVcomp2 = (buf[9] << 8) | buf[8]
 
 class TSL4531(i2c.I2C):
     '''
@@ -185,20 +268,25 @@ class TSL4531(i2c.I2C):
 TSL4531 class
 ===============
 
-.. class:: TSL4531(self, drvname, addr=0x29, clk=100000)
+.. class:: TSL4531(self, drvname, addr=0x29, clk=400000)
 
         Create an instance of the TSL4531 class.
 
         :param drvname: I2C Bus used '( I2C0, ... )'
         :param addr: Slave address, default 0x29
-        :param clk: Clock speed, default 100kHz
+        :param clk: Clock speed, default 400kHz (fast-mode, pull-ups of 2.2kOhm or less may be needed)
+
+        :meth:`getLUX` blocks until a conversion completes. To keep the main loop free while the
+        sensor integrates, call :meth:`trigger`, check :meth:`poll_ready` and then read with :meth:`getLUX`.
 
     '''
 
-    def __init__(self, drvname = I2C0, addr = 0x29, clk = 100000):
+    def __init__(self, drvname = I2C0, addr = 0x29, clk = 400000):
         i2c.I2C.__init__(self, drvname, addr, clk)
-        self._addr = addr
-        self.__LUX = 0.0
+        self._wr = self.write_read
+        self.__integration_ms = 100  # matches TSL4531_CONF_IT_100 and the x4 lux multiplier
+        self.__trigger_ms = 0
+        self.__triggered = False
         try:
             self.start()
         except PeripheralError as e:
@@ -210,32 +298,147 @@ TSL4531 class
 .. method:: init()
 
         Configure registers of TSL4531 for light measurement.
+        The sensor is left powered down and runs a single conversion on each read.
         Call after instantiating TSL4531 class.
         Exception raised if unsuccessful.
 
         '''
         try:
-            self.write_bytes((TSL4531_WRITE_CMD | TSL4531_REG_CONTROL), TSL4531_CONF_START)
-            self.write_bytes((TSL4531_WRITE_CMD | TSL4531_REG_CONF), TSL4531_CONF_IT_100)
+            cur = self.write_read((TSL4531_WRITE_CMD | TSL4531_REG_CONTROL), 2)
+            if cur[0] != TSL4531_CONF_PWR_DOWN:
+                self.write_bytes((TSL4531_WRITE_CMD | TSL4531_REG_CONTROL), TSL4531_CONF_PWR_DOWN)
+            if cur[1] != TSL4531_CONF_IT_100:
+                self.write_bytes((TSL4531_WRITE_CMD | TSL4531_REG_CONF), TSL4531_CONF_IT_100)
         except Exception as e:
             print(e)
             raise e
 
+    def trigger(self):
+        '''
+.. method:: trigger()
+
+        Starts a single light conversion. The result is available when :meth:`poll_ready` returns True.
+
+        '''
+        self.write_bytes((TSL4531_WRITE_CMD | TSL4531_REG_CONTROL), TSL4531_CONF_ONE_RUN)
+        self.__trigger_ms = timers.now()
+        self.__triggered = True
+
+    def pending(self):
+        '''
+.. method:: pending()
+
+        Returns True when a conversion has been triggered and not read yet.
+
+        '''
+        return self.__triggered
+
+    def poll_ready(self):
+        '''
+.. method:: poll_ready()
+
+        Returns True when the integration time of the last triggered conversion has elapsed,
+        False if no conversion has been triggered.
+
+        '''
+        if not self.__triggered:
+            return False
+        return (timers.now() - self.__trigger_ms) >= (self.__integration_ms + 5)
+
     def getLUX(self):
         '''
 .. method:: getLUX()
 
         Reads the luminosity value and returns it in LUX.
 
-        Return the LUX value as a float.
+        Return the LUX value as an integer.
 
         '''
         self.GET_TSL()
         return self.__LUX
         
     def GET_TSL(self):
-        multi = int(4)
-        raw_LUX_H = self.write_read((TSL4531_WRITE_CMD | TSL4531_REG_DATA_HIGH), 1)[0]
-        raw_LUX_L = self.write_read((TSL4531_WRITE_CMD | TSL4531_REG_DATA_LOW), 1)[0]
-        data = ((raw_LUX_H <<8)|(raw_LUX_L))
-        self.__LUX = multi*(float(data))
+        if not self.__triggered:
+            self.trigger()
+        while not self.poll_ready():
+            sleep(5)
+        self.__triggered = False
+        raw = self._wr((TSL4531_WRITE_CMD | TSL4531_REG_DATA_LOW), 2)
+        # x4 multiplier for 100ms integration time
+        self.__LUX = ((raw[1] << 8) | raw[0]) << 2
+
+
+class SL01():
+    '''
+
+===============
+SL01 class
+===============
+
+.. class:: SL01(self, drvname, veml_addr=0x10, tsl_addr=0x29, clk=400000)
+
+        Create an instance of the SL01 class, owning both the VEML6075 and the TSL4531 sensors.
+
+        :param drvname: I2C Bus used '( I2C0, ... )'
+        :param veml_addr: VEML6075 slave address, default 0x10
+        :param tsl_addr: TSL4531 slave address, default 0x29
+        :param clk: Clock speed, default 400kHz
+
+        :meth:`sample` blocks until both measurements complete. To keep the main loop free,
+        call :meth:`trigger`, check :meth:`poll_ready` and then read with :meth:`sample`.
+
+    '''
+
+    def __init__(self, drvname = I2C0, veml_addr = 0x10, tsl_addr = 0x29, clk = 400000):
+        self.veml = VEML6075(drvname, veml_addr, clk)
+        self.tsl = TSL4531(drvname, tsl_addr, clk)
+
+    def init(self):
+        '''
+.. method:: init()
+
+        Configure registers of both sensors.
+        Call after instantiating SL01 class.
+        Exception raised if unsuccessful.
+
+        '''
+        self.veml.init()
+        self.tsl.init()
+
+    def trigger(self):
+        '''
+.. method:: trigger()
+
+        Starts a measurement on both sensors. Results are available when :meth:`poll_ready` returns True.
+
+        '''
+        self.tsl.trigger()
+        self.veml.trigger()
+
+    def poll_ready(self):
+        '''
+.. method:: poll_ready()
+
+        Returns True when both sensors have completed the last triggered measurement.
+
+        '''
+        return self.veml.poll_ready() and self.tsl.poll_ready()
+
+    def sample(self):
+        '''
+.. method:: sample()
+
+        Reads UV and light values from both sensors, waiting for the measurement started by
+        :meth:`trigger` or starting a new one on each sensor with none pending. The two
+        conversions run together so that their integration times overlap.
+
+        Return a tuple (uva, uvb, uvi, lux).
+
+        '''
+        if not self.tsl.pending():
+            self.tsl.trigger()
+        if not self.veml.pending():
+            self.veml.trigger()
+        uva, uvb, uvi = self.veml.read_all()
+        lux = self.tsl.getLUX()
+        return (uva, uvb, uvi, lux)